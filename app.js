@@ -11,14 +11,18 @@ document.querySelectorAll(".tab-btn").forEach(btn => {
 
 /* ---------------- Data paths ---------------- */
 const DATA = {
+  root: "data/",
+  runManifest: "data/manifest.json",   // présent seulement si le convert tourne avec --store
   itemsManifest: "data/items/manifest.json",
   itemsDir: "data/items/",
   lootTables: "data/loot_tables.json",
-  lootLimits: "data/loot_limits.json",
+  lootLimitYields: "data/loot_limit_yields.json",
   lootTablesFlatV2: "data/loot_tables_flat_v2.json",
   lootBucketsByItemManifest: "data/buckets_by_item/manifest.json",
   lootBucketsByItemDir: "data/buckets_by_item/",
-  repairMap: "data/repair_map.json",
+  salvageManifest: "data/salvage/manifest.json",
+  salvageDir: "data/salvage/",
+  repairMap: "data/repair_map.json",   // ancien format (avant data/salvage/)
 };
 
 let manifest = null;         // items manifest (list of shard filenames)
@@ -26,12 +30,16 @@ let loadedShards = {};       // cache: shardKey -> array of items
 let allItemsIndex = null;    // cache if we load all shards
 let lootTables = null;
 let lootBuckets = null;
-let lootLimits = null;
+let lootLimitYields = null;  // { limits, tables, items } précalculé par le convert
 let lootTablesFlatV2 = null;
 let lootBucketsFlat  = null;
 let bucketsManifest = null;
 let loadedBucketShards = {}; // key -> array
-let repairMap = null;
+let salvageManifest = null;  // { shards, tables: {key: file}, items: {key: file}, tableIds }
+let salvageTableIds = null;  // Set(LootTableID) ayant une entrée salvage (null = inconnu)
+let loadedSalvageShards = {}; // "tables:3f" | "items:3f" -> Promise<{ id -> [...] }>
+let repairMap = null;         // fallback si data/salvage/ n'est pas encore généré
+let runManifest = null;      // Promise<{ files: { chemin logique -> fichier du store } }>
 
 
 
@@ -70,6 +78,9 @@ function coerceBool(v) {
   return null;
 }
 
+// tokens de rareté émis par le convert (cf. _rarity_token) ; styles.css a --color-rarity-<r>-100/200/300
+const RARITIES = ["common", "uncommon", "rare", "epic", "legendary", "artifact"];
+
 // ---------- Icons helpers ----------
 function getIconUrlFromItem(it) {
   const raw = (it && (it.ic || it.Icon)) ? String(it.ic || it.Icon) : null;
@@ -161,10 +172,26 @@ function shardKeyFromQuery(q) {
   return 'misc';
 }
 
+// Store adressé par contenu (--store) : "data/x.json" -> "data/<rel>/<hash>.json"
+async function resolveDataPath(path) {
+  if (!path.startsWith(DATA.root) || path === DATA.runManifest) return path;
+  if (!runManifest) {
+    // promesse en cache : les fetchJSON concurrents partagent un seul chargement
+    runManifest = fetch(`${DATA.runManifest}?v=${Date.now()}`, { cache: "no-store" })
+      .then(res => res.ok ? res.json() : { files: {} })
+      .catch(() => ({ files: {} }));
+  }
+  const hit = ((await runManifest).files || {})[path.slice(DATA.root.length)];
+  return hit ? DATA.root + hit : path;
+}
+
 async function fetchJSON(path) {
-  const sep = path.includes("?") ? "&" : "?";
-  const url = `${path}${sep}v=${Date.now()}`;   // cache-buster à chaque requête
-  const res = await fetch(url, { cache: "no-store" });
+  const resolved = await resolveDataPath(path);
+  // fichier nommé par son hash : immuable, le cache navigateur suffit
+  const immutable = /\/[0-9a-f]{64}\.json$/.test(resolved);
+  const sep = resolved.includes("?") ? "&" : "?";
+  const url = immutable ? resolved : `${resolved}${sep}v=${Date.now()}`;   // cache-buster à chaque requête
+  const res = await fetch(url, immutable ? {} : { cache: "no-store" });
   if (!res.ok) throw new Error(`Failed to load ${path}`);
   return res.json();
 }
@@ -177,10 +204,11 @@ async function ensureManifest() {
 
 async function ensureLootData() {
   if (!lootTables)       lootTables       = await fetchJSON(DATA.lootTables); 
-  if (!lootLimits)       lootLimits       = await fetchJSON(DATA.lootLimits);
+  if (!lootLimitYields)  lootLimitYields  = await fetchJSON(DATA.lootLimitYields)
+                                              .catch(() => ({ limits: {}, tables: {}, items: {} }));
   if (!lootTablesFlatV2) lootTablesFlatV2 = await fetchJSON(DATA.lootTablesFlatV2);
   if (!bucketsManifest)  await ensureBucketsManifest(); 
-  if (!repairMap)        repairMap        = await fetchJSON(DATA.repairMap);
+  if (!salvageManifest)  await ensureSalvageManifest();
 }
 
 async function getItemNameById(itemId) {
@@ -260,6 +288,62 @@ async function loadBucketsForItemId(itemId) {
 
 
 
+async function ensureSalvageManifest() {
+  if (salvageManifest) return salvageManifest;
+  salvageManifest = await fetchJSON(DATA.salvageManifest).catch(() => null);
+  if (!salvageManifest) {
+    // data/ pas encore regénéré : ancien repair_map.json (IDs seuls)
+    salvageManifest = { tables: {}, items: {} };
+    repairMap = await fetchJSON(DATA.repairMap).catch(() => ({}));
+  }
+  return salvageManifest;
+}
+
+// même bucket que salvage_shard_key() côté convert (FNV-1a 32 bits)
+function salvageShardKey(id, n) {
+  let h = 0x811c9dc5;
+  for (const ch of String(id || "")) h = Math.imul(h ^ ch.codePointAt(0), 0x01000193) >>> 0;
+  return (h % n).toString(16).padStart(2, "0");
+}
+
+function loadSalvageShard(kind, id) {
+  const key = salvageShardKey(id, salvageManifest?.shards || 64);
+  const cacheKey = `${kind}:${key}`;
+  if (!loadedSalvageShards[cacheKey]) {
+    const fn = (salvageManifest?.[kind] || {})[key];
+    loadedSalvageShards[cacheKey] = fn
+      ? fetchJSON(DATA.salvageDir + fn).catch(err => {
+          delete loadedSalvageShards[cacheKey];   // pas de rejet en cache : on retentera au prochain rendu
+          throw err;
+        })
+      : Promise.resolve({});
+  }
+  return loadedSalvageShards[cacheKey];
+}
+
+// Items qui ouvrent/salvagent vers cette LootTable : [{id, n, ry}]
+async function getSalvageItemsForTable(tableId) {
+  await ensureSalvageManifest();
+  if (salvageManifest.tableIds && !salvageTableIds) salvageTableIds = new Set(salvageManifest.tableIds);
+  // la plupart des tables n'ont pas d'entrée salvage : pas de fetch pour elles
+  if (salvageTableIds && !salvageTableIds.has(tableId)) return [];
+  const shard = await loadSalvageShard("tables", tableId);
+  if (shard[tableId]) return shard[tableId];
+  // ancien format : noms à résoudre via les shards items (un par un, chaque shard reste en cache)
+  const out = [];
+  for (const id of (repairMap || {})[tableId] || []) out.push({ id, n: await getItemNameById(id) });
+  return out;
+}
+
+// LootTables ouvertes par cet item : [LootTableID]
+async function getSalvageTablesForItem(itemId) {
+  await ensureSalvageManifest();
+  const shard = await loadSalvageShard("items", itemId);
+  return shard[itemId] || [];
+}
+
+
+
 /* ------------- Rendering ------------- */
 function renderItems(items) {
   itemsTable.innerHTML = "";
@@ -347,6 +431,28 @@ function fmtProb(p) {
   return `${pct.toFixed(2)}%`;
 }
 
+// util: durée en secondes -> "18h", "15m", "31d"
+function fmtDuration(sec) {
+  const s = Number(sec);
+  if (!isFinite(s) || s <= 0) return "—";
+  if (s >= 86400 && s % 86400 === 0) return `${s / 86400}d`;
+  if (s >= 3600) return `${+(s / 3600).toFixed(1)}h`;
+  if (s >= 60) return `${+(s / 60).toFixed(1)}m`;
+  return `${s}s`;
+}
+
+// "GypsumBlue · at most 2 / 18h · at most 0.11/h" : bornes supérieures précalculées
+// (pas des espérances : les probabilités de drop ne sont pas prises en compte)
+function fmtLootLimit(lid, mw, mh) {
+  const lim = (lootLimitYields?.limits || {})[lid] || {};
+  const win = lim.lt ? "lifetime" : fmtDuration(lim.w);
+  const parts = [`<b>${lid}</b>`];
+  if (mw != null) parts.push(`at most ${+Number(mw).toFixed(2)} / ${win}`);
+  if (mh != null) parts.push(`at most ${+Number(mh).toFixed(2)}/h`);
+  if (lim.pt) parts.push(`pity +${fmtProb(lim.pt)}`);
+  return parts.join(" · ");
+}
+
 function recordMeta(rec) {
   // On accepte plein de variantes d'entêtes
   const logic = getField(rec, ["AND/OR", "ANDOR", "AndOr", "Logic", "AND", "OR"]);
@@ -479,25 +585,29 @@ async function showItemDetails(item) {
     const roll  = meta.RollBonusSetting || "—";
     const maxr  = (meta.MaxRoll ?? "—");
 
-    // Items qui ouvrent cette LootTable via "Repair Recipe"
-    let repairLine = "";
-    if (repairMap && repairMap[tableId] && repairMap[tableId].length) {
-      // On construit dynamiquement les liens avec les noms
-      const repairItems = repairMap[tableId];
-      const linksPromises = repairItems.map(async (id) => {
-        const name = await getItemNameById(id);
-        return `<a class="link" href="#item=${encodeURIComponent(id)}">${name}</a>`;
-      });
-      // on attend toutes les promesses et on insère après
-      Promise.all(linksPromises).then(resolvedLinks => {
-        const html = `<div class="text-sm mt-1">Opened/Salvaged by: ${resolvedLinks.join(", ")}</div>`;
-        // insérer dans le container déjà rendu
-        const container = document.getElementById(`loot-${tableId}`);
-        if (container) container.innerHTML = html;
+    // Loot limits qui plafonnent cette table (jointure faite au build)
+    const tableLimits = (lootLimitYields?.tables || {})[tableId] || [];
+    const limitLine = tableLimits.length
+      ? `<div class="text-sm mt-1">Loot limit: ${tableLimits.map(lid => {
+          const lim = lootLimitYields.limits[lid] || {};
+          return fmtLootLimit(lid, lim.mw, lim.mh);
+        }).join(", ")}</div>`
+      : "";
+
+    // Items qui ouvrent cette LootTable via "Repair Recipe" (noms/rareté déjà résolus au build)
+    getSalvageItemsForTable(tableId).then(items => {
+      if (!items.length) return;
+      const links = items.map(it => {
+        const ry = RARITIES.includes(it.ry) ? it.ry : "common";
+        return `<a class="link" style="color: var(--color-rarity-${ry}-100)" href="#item=${encodeURIComponent(it.id)}">${it.n || it.id}</a>`;
       });
-      // placeholder vide au rendu initial
-      repairLine = `<div id="loot-${tableId}" class="repair-line text-sm mt-1 opacity-70">Loading salvage info…</div>`;
-    }
+      const html = `Opened/Salvaged by: ${links.join(", ")}`;
+      // insérer dans le(s) container(s) déjà rendu(s)
+      detailsDiv.querySelectorAll(`[data-salvage-table="${CSS.escape(tableId)}"]`)
+        .forEach(el => { el.innerHTML = html; });
+    }).catch(err => console.warn(`salvage info for ${tableId}:`, err));  // placeholder reste vide
+    // placeholder vide au rendu initial
+    const repairLine = `<div data-salvage-table="${tableId}" class="repair-line text-sm mt-1"></div>`;
 
 
 
@@ -547,6 +657,7 @@ async function showItemDetails(item) {
           <div class="text-sm opacity-80">
             Logic: <b>${logic}</b> · RollBonus: <b>${roll}</b> · MaxRoll: <b>${maxr}</b>
           </div>
+          ${limitLine}
           ${repairLine} 
         </div>
         <div class="overflow-x-auto">
@@ -583,18 +694,37 @@ async function showItemDetails(item) {
 
 
   
+  // Bornes supérieures de rendement de l'item (par fenêtre de cooldown et par heure)
+  const itemLimits = (lootLimitYields?.items || {})[item.id] || [];
+  const limitsHtml = itemLimits.length
+    ? `<ul class="text-sm">${itemLimits.map(y =>
+        `<li>${fmtLootLimit(y.l, y.mw, y.mh)}${y.t ? ` (via ${y.t}, max qty per drop ${y.mq})` : ""}</li>`
+      ).join("")}</ul>`
+    : `<p class="opacity-70">No loot limit.</p>`;
+
+  // LootTables que cet item ouvre (sens item -> tables de l'index salvage)
+  getSalvageTablesForItem(item.id).then(tids => {
+    if (!tids.length) return;
+    const el = detailsDiv.querySelector(`[data-salvage-item="${CSS.escape(item.id)}"]`);
+    if (el) el.innerHTML = `Opens/Salvages into: ${tids.map(t => `<b>${t}</b>`).join(", ")}`;
+  }).catch(err => console.warn(`salvage info for ${item.id}:`, err));  // placeholder reste vide
+
   finalHtml = `
     <div class="item-header mb-2">
       ${iconHtml}
       <div class="item-header-meta">
         <h2 class="text-xl font-bold">${item.n || item.id}</h2>
         <p class="opacity-80"><b>ID:</b> ${item.id} | <b>Type:</b> ${item.t || "—"} | <b>Tier:</b> ${item.tr ?? "—"}</p>
+        <div data-salvage-item="${item.id}" class="text-sm opacity-80"></div>
       </div>
     </div>
 
     <h3 class="text-lg font-semibold mb-2">Loot Tables</h3>
     ${tablesHtml}
 
+    <h3 class="text-lg font-semibold mt-6 mb-2">Loot Limits (upper bounds)</h3>
+    ${limitsHtml}
+
     <h3 class="text-lg font-semibold mt-6 mb-2">Loot Buckets (direct)</h3>
     ${bucketsHtml}
 
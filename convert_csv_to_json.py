@@ -1,17 +1,38 @@
 import pandas as pd
 from pathlib import Path
 import json, re, argparse, sys
-import math
+import math, hashlib, os
 
 # -------- CLI --------
 parser = argparse.ArgumentParser(description="Convert NW CSVs to sharded JSON for GitHub Pages.")
-parser.add_argument("--in", dest="in_dir", default=".", help="Folder where CSV files live (default: current folder)")
-parser.add_argument("--out", dest="out_dir", default="data", help="Output folder for JSON (default: data)")
+parser.add_argument("--in", dest="in_dir", default=None, help="Folder where CSV files live (default: current folder)")
+parser.add_argument("--out", dest="out_dir", default=None, help="Output folder for JSON (default: data)")
+parser.add_argument("--batch", dest="batch", default=None,
+                    help="JSON file listing runs to convert in one invocation: "
+                         "[{\"in\": DIR, \"out\": DIR, \"csv\": {key: file name}, \"name\": label}, ...]. "
+                         "\"in\" and \"out\" are required; relative paths resolve against the batch file's folder; "
+                         "\"csv\" overrides entries of CSV_MAP (items, loot_tables, loot_buckets, loot_limits)")
+parser.add_argument("--store", dest="store_dir", default=None,
+                    help="Content-addressed store: JSON files are written once as <sha256>.json and manifests point into it")
 args = parser.parse_args()
+if args.batch and (args.in_dir or args.out_dir):
+    parser.error("--in/--out cannot be combined with --batch (set \"in\"/\"out\" per run in the batch file)")
 
-IN_DIR = Path(args.in_dir).resolve()
-OUT_DIR = Path(args.out_dir).resolve()
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+IN_DIR = Path(args.in_dir or ".").resolve()
+OUT_DIR = Path(args.out_dir or "data").resolve()
+if not args.batch:
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Store partagé entre runs (None = écriture classique dans OUT_DIR)
+STORE_DIR = Path(args.store_dir).resolve() if args.store_dir else None
+STORE_STATS = {"written": 0, "reused": 0}
+RUN_FILES = {}  # chemin logique (relatif à OUT_DIR) -> fichier du store, pour le run courant
+
+# Cache des DataFrames parsés (mode --batch seulement), clé = hash du contenu CSV.
+# _FRAME_KEEP = hashes encore utiles (run courant + runs suivants) ; None = pas de cache.
+_FRAME_CACHE = {}
+_FRAME_KEEP = None
+_HASH_CACHE = {}  # (chemin, mtime, taille) -> sha1, évite de re-hasher un même fichier
 
 # CSV file names (unchanged)
 CSV_MAP = {
@@ -39,13 +60,30 @@ def find_csv(name: str) -> Path:
     raise FileNotFoundError(f"Could not find '{name}' under {IN_DIR}. "
                             f"Place your CSVs there or pass --in PATH.")
 
+def csv_hash(path: Path) -> str:
+    st = Path(path).stat()
+    k = (str(path), st.st_mtime_ns, st.st_size)
+    if k not in _HASH_CACHE:
+        _HASH_CACHE[k] = hashlib.sha1(Path(path).read_bytes()).hexdigest()
+    return _HASH_CACHE[k]
+
 def load_csv_safely(path: Path) -> pd.DataFrame:
+    key = csv_hash(path) if _FRAME_KEEP is not None else None
+    if key in _FRAME_CACHE:
+        return _FRAME_CACHE[key].copy()
+    df = None
     for enc in ("utf-8", "utf-8-sig", "latin-1"):
         try:
-            return pd.read_csv(path, encoding=enc, low_memory=False)
+            df = pd.read_csv(path, encoding=enc, low_memory=False)
+            break
         except Exception:
             continue
-    return pd.read_csv(path, encoding="utf-8", engine="python")
+    if df is None:
+        df = pd.read_csv(path, encoding="utf-8", engine="python")
+    if key is None or key not in _FRAME_KEEP:
+        return df
+    _FRAME_CACHE[key] = df
+    return df.copy()
 
 def normalize_cols(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -77,6 +115,18 @@ def _shard_key_from_itemid(item_id: str) -> str:
         return c
     return "misc"
 
+SALVAGE_SHARDS = 64
+
+def salvage_shard_key(key: str, n: int = SALVAGE_SHARDS) -> str:
+    """
+    Bucket stable (FNV-1a 32 bits, recalculé tel quel par app.js) : les IDs
+    salvage sont trop déséquilibrés par 1ère lettre (MasterSalvage*) pour shard_key_from_id.
+    """
+    h = 0x811c9dc5
+    for ch in str(key):
+        h = ((h ^ ord(ch)) * 0x01000193) & 0xffffffff
+    return f"{h % n:02x}"
+
 def _json_sanitize(x):
     """Convertit NaN/NaT en None, strings vides en None quand pertinent."""
     if x is None:
@@ -86,8 +136,24 @@ def _json_sanitize(x):
     return x
 
 
-def write_json(path: Path, data):
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _rarity_token(v) -> str:
+    """Token de rareté compact (common/uncommon/rare/epic/legendary/artifact)."""
+    rv = str(v).strip().lower()
+    # normalize some variants
+    MAP = {
+        "common":"common","uncommon":"uncommon","rare":"rare",
+        "epic":"epic","legendary":"legendary","artifact":"artifact",
+        "artifacts":"artifact","mythic":"artifact"
+    }
+    return MAP.get(rv, rv)  # fallback to raw lowercased value
+
+
+def write_json(path: Path, data) -> Path:
+    """
+    Écrit data en JSON compact et renvoie le fichier réellement écrit.
+    Avec --store, tout sauf les manifest.json part dans STORE_DIR/<hash>.json
+    (écrit une seule fois si le contenu existe déjà) et RUN_FILES garde le lien.
+    """
     # Sanitize profonde (évite NaN dans le JSON final)
     def deep_clean(obj):
         if isinstance(obj, dict):
@@ -96,8 +162,29 @@ def write_json(path: Path, data):
             return [deep_clean(v) for v in obj]
         return _json_sanitize(obj)
     clean = deep_clean(data)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(clean, f, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+    if STORE_DIR is None or path.name == "manifest.json":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(clean, f, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+        return path
+
+    blob = json.dumps(clean, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+    target = STORE_DIR / f"{hashlib.sha256(blob).hexdigest()}.json"
+    if target.exists():
+        STORE_STATS["reused"] += 1
+    else:
+        STORE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(target)
+        STORE_STATS["written"] += 1
+    RUN_FILES[path.relative_to(OUT_DIR).as_posix()] = _rel_ref(OUT_DIR, target)
+    return target
+
+def _rel_ref(base_dir: Path, target: Path) -> str:
+    """Chemin relatif (style URL) de base_dir vers target, pour les manifests."""
+    return Path(os.path.relpath(target, base_dir)).as_posix()
 
 def convert_items():
     src = find_csv(CSV_MAP["items"])
@@ -169,14 +256,7 @@ def convert_items():
             except Exception: rec["tr"] = str(row[tier_col])
         # rarity: keep a compact, normalized token (common/uncommon/rare/epic/legendary/artifact)
         if rarity_col and pd.notna(row[rarity_col]):
-            rv = str(row[rarity_col]).strip().lower()
-            # normalize some variants
-            MAP = {
-                "common":"common","uncommon":"uncommon","rare":"rare",
-                "epic":"epic","legendary":"legendary","artifact":"artifact",
-                "artifacts":"artifact","mythic":"artifact"
-            }
-            rec["ry"] = MAP.get(rv, rv)  # fallback to raw lowercased value
+            rec["ry"] = _rarity_token(row[rarity_col])
         if icon_col and (icon_col in df.columns):
             v = row[icon_col]
             if isinstance(v, str):
@@ -208,8 +288,7 @@ def convert_items():
     manifest = {"files": {}, "count": len(records)}
     for key, arr in shards.items():
         filename = f"items_{key}.json"
-        write_json(items_dir / filename, arr)
-        manifest["files"][key] = filename
+        manifest["files"][key] = _rel_ref(items_dir, write_json(items_dir / filename, arr))
     write_json(items_dir / "manifest.json", manifest)
     print(f"[items] {manifest['count']} records, {len(shards)} shards -> {items_dir}/  (with icons: {icon_count})")
 
@@ -217,8 +296,12 @@ def convert_items():
 def build_repair_map():
     """
     Parcourt S9_extract_items_20250820.csv, lit la colonne 'Repair Recipe',
-    extrait toutes les références [LTID]TableId et écrit data/repair_map.json :
-      { LootTableID: [ItemID, ...], ... }
+    extrait toutes les références [LTID]TableId et écrit l'index de salvage
+    dans les deux sens, shardé par salvage_shard_key(clé) (data/salvage/) :
+      tables_{k}.json : { LootTableID: [{id, n, ry}, ...], ... }  (items qui l'ouvrent)
+      items_{k}.json  : { ItemID: [LootTableID, ...], ... }        (tables qu'il ouvre)
+      manifest.json   : fichiers par shard + tableIds (tables ayant au moins un item)
+    Noms et rareté sont résolus ici pour que la page n'ait pas à charger les shards items.
     """
     src = find_csv(CSV_MAP["items"])
     df  = load_csv_safely(src)
@@ -230,17 +313,24 @@ def build_repair_map():
 
     id_col = header_map.get("itemid") or header_map.get("id")
     rr_col = header_map.get("repairrecipe") or header_map.get("repair_recipe") or header_map.get("repair")
+    name_col   = header_map.get("name") or header_map.get("displayname") or header_map.get("itemname")
+    rarity_col = header_map.get("rarity") or header_map.get("itemrarity")
+
+    salvage_dir = OUT_DIR / "salvage"
+    manifest = {"shards": SALVAGE_SHARDS, "tables": {}, "items": {}, "tableIds": [],
+                "count": {"tables": 0, "items": 0}}
 
     if not id_col or not rr_col:
-        # pas bloquant : on écrit un map vide
-        write_json(OUT_DIR / "repair_map.json", {})
-        print("[repair_map] Missing columns (ItemID or Repair Recipe). Wrote empty map.")
+        # pas bloquant : on écrit un index vide
+        write_json(salvage_dir / "manifest.json", manifest)
+        print("[salvage] Missing columns (ItemID or Repair Recipe). Wrote empty index.")
         return
 
     # regex : [LTID]TableName
     rx = re.compile(r'\[LTID\]\s*([A-Za-z0-9_]+)', re.I)
 
-    rep = {}
+    by_table = {}  # LootTableID -> {ItemID: {id, n, ry}}
+    by_item  = {}  # ItemID -> set(LootTableID)
     for _, row in df.iterrows():
         item_id = str(row[id_col]) if pd.notna(row[id_col]) else ""
         if not item_id:
@@ -250,16 +340,35 @@ def build_repair_map():
             continue
 
         hits = rx.findall(cell)
+        if not hits:
+            continue
+        rec = {"id": item_id}
+        if name_col and pd.notna(row[name_col]): rec["n"] = str(row[name_col])
+        if rarity_col and pd.notna(row[rarity_col]): rec["ry"] = _rarity_token(row[rarity_col])
         for table_id in hits:
-            rep.setdefault(table_id, []).append(item_id)
-
-    # dédoublonnage + tri léger
-    for k, arr in rep.items():
-        rep[k] = sorted(set(arr))
-
-    out = OUT_DIR / "repair_map.json"
-    write_json(out, rep)
-    print(f"[repair_map] {len(rep)} loot tables referenced -> {out}")
+            by_table.setdefault(table_id, {})[item_id] = rec
+            by_item.setdefault(item_id, set()).add(table_id)
+
+    # shards par clé (dédoublonnage + tri léger)
+    table_shards = {}
+    for tid, recs in by_table.items():
+        table_shards.setdefault(salvage_shard_key(tid), {})[tid] = [recs[k] for k in sorted(recs)]
+    item_shards = {}
+    for iid, tids in by_item.items():
+        item_shards.setdefault(salvage_shard_key(iid), {})[iid] = sorted(tids)
+
+    for key, data in sorted(table_shards.items()):
+        fn = f"tables_{key}.json"
+        manifest["tables"][key] = _rel_ref(salvage_dir, write_json(salvage_dir / fn, dict(sorted(data.items()))))
+    for key, data in sorted(item_shards.items()):
+        fn = f"items_{key}.json"
+        manifest["items"][key] = _rel_ref(salvage_dir, write_json(salvage_dir / fn, dict(sorted(data.items()))))
+    # IDs des tables qui ont au moins un item : la page ne charge un shard que pour elles
+    manifest["tableIds"] = sorted(by_table)
+    manifest["count"] = {"tables": len(by_table), "items": len(by_item)}
+    write_json(salvage_dir / "manifest.json", manifest)
+    print(f"[salvage] {len(by_table)} loot tables, {len(by_item)} items "
+          f"({len(table_shards)}+{len(item_shards)} shards) -> {salvage_dir}/")
 
 
 
@@ -278,7 +387,7 @@ import re, math
 
 
 def flatten_loot_tables_triple_rows():
-    src = find_csv("LootTables.csv")
+    src = find_csv(CSV_MAP["loot_tables"])
     df  = load_csv_safely(src)
     df  = normalize_cols(df)
 
@@ -388,6 +497,7 @@ def flatten_loot_tables_triple_rows():
     path = OUT_DIR / "loot_tables_flat_v2.json"
     write_json(path, out)
     print(f"loot_tables_flat_v2: {len(out)} rows -> {path}")
+    return out
 
 
 
@@ -398,7 +508,7 @@ def flatten_loot_buckets_from_firstrow_sharded():
       Chaque groupe X a (optionnellement) LootBiasingDisabledX, TagsX, MatchOneX, ItemX, QuantityX, OddsX.
       Les lignes en-dessous contiennent les items (ItemX non vide) => 1 sortie par (BucketID, ItemID).
     """
-    src = find_csv("LootBuckets.csv")
+    src = find_csv(CSV_MAP["loot_buckets"])
     print(f"[loot_buckets_firstrow] Reading: {src}")
     df = load_csv_safely(src)
     df = normalize_cols(df)
@@ -572,10 +682,228 @@ def flatten_loot_buckets_from_firstrow_sharded():
     manifest = {"files": {}, "count": len(all_rows)}
     for key, arr in shards.items():
         fn = f"buckets_{key}.json"
-        write_json(out_dir / fn, arr)
-        manifest["files"][key] = fn
+        manifest["files"][key] = _rel_ref(out_dir, write_json(out_dir / fn, arr))
     write_json(out_dir / "manifest.json", manifest)
     print(f"[loot_buckets_firstrow] {manifest['count']} rows -> {out_dir}/ (shards: {len(shards)})")
+    return all_rows
+
+
+
+def build_loot_limit_yields(table_rows=None, bucket_rows=None):
+    """
+    Joint S9_extract_loot-limits aux LootTables / LootBuckets / items et
+    précalcule des BORNES SUPÉRIEURES de rendement (par heure et par fenêtre
+    de cooldown). Ce ne sont pas des espérances : Probs / MaxRoll / Odds ne
+    sont pas pris en compte, chaque ligne est supposée tirée.
+    Écrit data/loot_limit_yields.json :
+      {
+        "limits": { LootLimitID: {n, c, w, g, pt, lt, mw, mh}, ... },
+        "tables": { LootTableID: [LootLimitID, ...], ... },
+        "items":  { ItemID: [{l, t, mq, mw, mh}, ...], ... }
+      }
+      mw / mh : drops max par fenêtre / par heure (× mq pour les items)
+      mq      : quantité max de l'item pour UN drop de la table racine t
+    Une table est limitée si sa ligne porte une colonne LootLimitID, si ses
+    Conditions citent une limite, ou si son ID est celui d'une limite ; la
+    limite s'applique aussi à ses sous-tables ([LTID]) et à ses buckets ([LBID]).
+    Un item est limité s'il sort d'une table limitée ou si son ID est celui d'une limite.
+    """
+    if table_rows is None:
+        table_rows = flatten_loot_tables_triple_rows()
+    if bucket_rows is None:
+        bucket_rows = flatten_loot_buckets_from_firstrow_sharded()
+
+    src = find_csv(CSV_MAP["loot_limits"])
+    print(f"[loot_limit_yields] Reading: {src}")
+    df = load_csv_safely(src)
+    df = normalize_cols(df)
+    header_map = {norm_header(c): c for c in df.columns}
+
+    def col(*keys):
+        return next((header_map[k] for k in keys if k in header_map), None)
+
+    id_col     = col("lootlimitid", "id")
+    name_col   = col("name")
+    count_col  = col("countlimit")
+    expire_col = col("limitexpireseconds")
+    min_col    = col("minlimitseconds")
+    max_col    = col("maxlimitseconds")
+    pity_col   = col("pitytickeroddsmod")
+
+    if not id_col:
+        write_json(OUT_DIR / "loot_limit_yields.json", {"limits": {}, "tables": {}, "items": {}})
+        print("[loot_limit_yields] Missing column (Loot Limit ID). Wrote empty index.")
+        return
+
+    def num(v):
+        if _is_empty(v): return 0.0
+        try:
+            f = float(v)
+            return 0.0 if math.isnan(f) or math.isinf(f) else f
+        except Exception:
+            return 0.0
+
+    def qty_max(v):
+        # "3-7" -> 7.0, "1.0" -> 1.0, vide -> 1.0
+        if _is_empty(v): return 1.0
+        nums = [num(x) for x in re.findall(r"\d+(?:\.\d+)?", str(v))]
+        return max(nums) if nums else 1.0
+
+    # --- 1) Limites + plafonds précalculés
+    limits = {}
+    for _, row in df.iterrows():
+        lid = None if _is_empty(row[id_col]) else str(row[id_col]).strip()
+        if not lid:
+            continue
+        count  = int(num(row[count_col])) if count_col else 0
+        expire = num(row[expire_col]) if expire_col else 0.0
+        lo     = num(row[min_col]) if min_col else 0.0
+        hi     = num(row[max_col]) if max_col else 0.0
+        gap    = lo if lo > 0 else hi  # délai minimal entre deux drops (le plafond utilise le plus court)
+        pity   = num(row[pity_col]) if pity_col else 0.0
+
+        rec = {"c": count}
+        if name_col and not _is_empty(row[name_col]): rec["n"] = str(row[name_col])
+        if expire > 0: rec["w"] = int(expire)
+        if hi > 0 or lo > 0: rec["g"] = [int(lo), int(hi)]
+        if pity: rec["pt"] = pity
+
+        if count <= 0:
+            # pas de compteur : seul le délai entre drops plafonne
+            rec["mw"] = None
+            rec["mh"] = round(3600 / gap, 4) if gap > 0 else None
+        elif expire <= 0:
+            # jamais réinitialisée : plafond à vie, pas de débit horaire durable
+            rec["lt"] = 1
+            rec["mw"] = count
+            rec["mh"] = None
+        else:
+            per_window = count if gap <= 0 else min(count, int(expire // gap) + 1)
+            rates = [count * 3600 / expire]
+            if gap > 0:
+                rates.append(3600 / gap)
+            rec["mw"] = per_window
+            rec["mh"] = round(min(rates), 4)
+        limits[lid] = rec
+
+    by_lower = {k.lower(): k for k in limits}
+
+    # --- 2) Tables limitées : colonne LootLimitID / Conditions / ID identique
+    gated = {}        # LootTableID -> set(LootLimitID)
+    cond_tokens = {}  # LootTableID -> set(tokens de Conditions, minuscules)
+    try:
+        tdf = normalize_cols(load_csv_safely(find_csv(CSV_MAP["loot_tables"])))
+        t_header = {norm_header(c): c for c in tdf.columns}
+        t_id_col    = t_header.get("loottableid")
+        t_limit_col = t_header.get("lootlimitid") or t_header.get("lootlimit")
+        t_cond_col  = t_header.get("conditions") or t_header.get("condition")
+        if t_id_col and (t_limit_col or t_cond_col):
+            for _, row in tdf.iterrows():
+                tid = None if _is_empty(row[t_id_col]) else str(row[t_id_col]).strip()
+                if not tid or re.search(r"_(Qty|Probs)$", tid, flags=re.I):
+                    continue
+                for c in (t_limit_col, t_cond_col):
+                    if not c or _is_empty(row[c]):
+                        continue
+                    toks = [t.strip() for t in re.split(r"[,\|;\s]+", str(row[c])) if t.strip()]
+                    if c == t_cond_col:
+                        cond_tokens.setdefault(tid, set()).update(t.lower() for t in toks)
+                    for tok in toks:
+                        lid = by_lower.get(tok.lower())
+                        if lid:
+                            gated.setdefault(tid, set()).add(lid)
+    except FileNotFoundError:
+        pass
+
+    table_ids = {r["LootTableID"] for r in table_rows}
+    for tid in table_ids:
+        lid = by_lower.get(tid.lower())
+        if lid:
+            gated.setdefault(tid, set()).add(lid)
+
+    # --- 3) Quantité max par item pour UN drop de chaque table racine limitée
+    rows_by_table = {}
+    for r in table_rows:
+        rows_by_table.setdefault(r["LootTableID"], []).append(r)
+    rows_by_bucket = {}
+    for r in bucket_rows:
+        rows_by_bucket.setdefault(r["BucketID"], []).append(r)
+
+    # tags "sélecteurs" = IDs de table ou tokens de Conditions ; les autres tags
+    # (Level:59, nom de boss, zone…) viennent du monde et sont supposés satisfaits
+    selectors = {t.lower() for t in table_ids}
+    for toks in cond_tokens.values():
+        selectors |= toks
+
+    def bucket_row_ok(b, context):
+        if _is_empty(b.get("Tags")):
+            return True
+        tags = {t.strip().lower() for t in str(b["Tags"]).split(",")}
+        return (tags & selectors) <= context
+
+    def max_drop(tid, context, parents, seen):
+        """ItemID -> quantité max pour un tirage de tid (AND : somme des lignes, OR : max)."""
+        if tid in parents:
+            return {}
+        parents = parents | {tid}
+        context = context | {tid.lower()} | cond_tokens.get(tid, set())
+        seen.add(tid)
+        rows = rows_by_table.get(tid, [])
+        is_or = any(str(r.get("AndOr") or "").strip().upper() == "OR" for r in rows)
+        total = {}
+        for r in rows:
+            q = qty_max(r["Qty"])
+            if r["RefType"] == "ltid":
+                sub = {k: v * q for k, v in max_drop(r["Ref"], context, parents, seen).items()}
+            elif r["RefType"] == "lbid":
+                # un seul item tiré par pick : une entrée par (BucketID, ItemID), au max
+                sub = {}
+                for b in rows_by_bucket.get(r["Ref"], []):
+                    if bucket_row_ok(b, context):
+                        sub[b["ItemID"]] = max(sub.get(b["ItemID"], 0.0), qty_max(b["Quantity"]) * q)
+            else:
+                sub = {r["Ref"]: q}
+            for k, v in sub.items():
+                total[k] = max(total.get(k, 0.0), v) if is_or else total.get(k, 0.0) + v
+        return total
+
+    tables_out = {}  # LootTableID (racine ou sous-table) -> set(LootLimitID)
+    items = {}       # ItemID -> {(LootLimitID, LootTableID racine): quantité max}
+    for root, lids in gated.items():
+        seen = set()
+        for item_id, q in max_drop(root, frozenset(), frozenset(), seen).items():
+            for lid in lids:
+                items.setdefault(item_id, {})[(lid, root)] = q
+        for tid in seen:
+            tables_out.setdefault(tid, set()).update(lids)
+
+    referenced = {r["Ref"] for r in table_rows if r["RefType"] == "item"}
+    referenced |= {r["ItemID"] for r in bucket_rows}
+    for item_id in referenced:
+        lid = by_lower.get(item_id.lower())
+        if lid and not any(k[0] == lid for k in items.get(item_id, {})):
+            items.setdefault(item_id, {})[(lid, None)] = 1.0
+
+    # --- 4) Bornes de rendement = drops max × quantité max par drop
+    items_out = {}
+    for item_id, hits in items.items():
+        arr = []
+        for (lid, tid), q in sorted(hits.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+            lim = limits[lid]
+            entry = {"l": lid, "mq": round(q, 4)}
+            if tid: entry["t"] = tid
+            entry["mw"] = round(lim["mw"] * q, 4) if lim["mw"] is not None else None
+            entry["mh"] = round(lim["mh"] * q, 4) if lim["mh"] is not None else None
+            arr.append(entry)
+        items_out[item_id] = arr
+
+    out = OUT_DIR / "loot_limit_yields.json"
+    write_json(out, {
+        "limits": limits,
+        "tables": {tid: sorted(lids) for tid, lids in sorted(tables_out.items())},
+        "items": dict(sorted(items_out.items())),
+    })
+    print(f"[loot_limit_yields] {len(limits)} limits, {len(tables_out)} tables, {len(items_out)} items -> {out}")
 
 
 
@@ -696,18 +1024,87 @@ def debug_scan_lootbuckets_for(item_id: str):
 def main():
     print(f"Input dir: {IN_DIR}")
     print(f"Output dir: {OUT_DIR}")
+    RUN_FILES.clear()
     convert_items()
     build_repair_map()
     convert_simple("loot_tables")
     convert_simple("loot_buckets")
     convert_simple("loot_limits")
-    flatten_loot_tables_triple_rows()
-    flatten_loot_buckets_from_firstrow_sharded()
+    table_rows  = flatten_loot_tables_triple_rows()
+    bucket_rows = flatten_loot_buckets_from_firstrow_sharded()
+    build_loot_limit_yields(table_rows, bucket_rows)
+    # manifest du run : chemin logique -> fichier du store (lu par app.js).
+    # Toujours écrit (vide sans --store) pour écraser celui d'un run --store précédent.
+    write_json(OUT_DIR / "manifest.json", {"files": dict(sorted(RUN_FILES.items()))})
+    if STORE_DIR is not None:
+        print(f"[store] {len(RUN_FILES)} files -> {STORE_DIR}/")
     print("Done.")
 
-if __name__ == "__main__":
+
+def run_batch(batch_file: str):
+    """
+    Convertit plusieurs jeux d'extracts (saisons / locales) en une seule invocation.
+    batch_file = liste JSON de runs : [{"in": DIR, "out": DIR, "csv": {clé CSV_MAP: nom}}, ...]
+    (chemins relatifs au dossier du fichier batch). Un CSV identique entre runs
+    n'est parsé qu'une fois : sa frame reste en cache jusqu'au dernier run qui
+    l'utilise. Avec --store, les fichiers identiques ne sont écrits qu'une fois.
+    """
+    global IN_DIR, OUT_DIR, CSV_MAP, _FRAME_KEEP
+    batch_path = Path(batch_file).resolve()
     try:
+        runs = json.loads(batch_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        parser.error(f"--batch {batch_file}: {e}")
+    if not isinstance(runs, list) or not runs:
+        parser.error(f"--batch {batch_file}: expected a non-empty JSON list of runs")
+
+    base_csv = dict(CSV_MAP)
+    plan = []  # (label, IN_DIR, OUT_DIR, CSV_MAP)
+    for i, run in enumerate(runs, 1):
+        if not isinstance(run, dict):
+            parser.error(f"--batch {batch_file}: run #{i} is not an object")
+        for k in ("in", "out"):
+            if not isinstance(run.get(k), str) or not run[k].strip():
+                parser.error(f"--batch {batch_file}: run #{i} is missing \"{k}\"")
+        csv = run.get("csv", {})
+        if not isinstance(csv, dict) or set(csv) - set(base_csv):
+            parser.error(f"--batch {batch_file}: run #{i} \"csv\" keys must be among {sorted(base_csv)}")
+        in_dir  = (batch_path.parent / run["in"]).resolve()
+        out_dir = (batch_path.parent / run["out"]).resolve()
+        plan.append((run.get("name", out_dir.name), in_dir, out_dir, {**base_csv, **csv}))
+
+    # dernier run qui utilise chaque CSV (par hash de contenu) -> durée de vie du cache
+    last_use = {}
+    for i, (_, in_dir, _, csv_map) in enumerate(plan):
+        IN_DIR = in_dir
+        for name in csv_map.values():
+            try:
+                last_use[csv_hash(find_csv(name))] = i
+            except FileNotFoundError:
+                pass  # l'erreur sortira pendant le run lui-même
+
+    parsed = 0
+    for i, (label, in_dir, out_dir, csv_map) in enumerate(plan):
+        IN_DIR, OUT_DIR, CSV_MAP = in_dir, out_dir, csv_map
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+        _FRAME_KEEP = {h for h, last in last_use.items() if last >= i}
+        before = set(_FRAME_CACHE)
+        print(f"\n=== [batch {i + 1}/{len(plan)}] {label} ===")
         main()
+        parsed += len(set(_FRAME_CACHE) - before)
+        for h in [h for h in _FRAME_CACHE if last_use.get(h, -1) <= i]:
+            del _FRAME_CACHE[h]  # plus aucun run suivant n'en a besoin
+    _FRAME_KEEP = None
+    print(f"\n[batch] {len(plan)} runs, {parsed} CSV parsed")
+    if STORE_DIR is not None:
+        print(f"[batch] store: {STORE_STATS['written']} written, {STORE_STATS['reused']} reused -> {STORE_DIR}/")
+
+if __name__ == "__main__":
+    try:
+        if args.batch:
+            run_batch(args.batch)
+        else:
+            main()
     except FileNotFoundError as e:
         print("\nERROR:", e)
         print("\nTips:")
@@ -715,4 +1112,3 @@ if __name__ == "__main__":
         print(" - Or place them next to the script, then run without --in")
         print(" - Current working dir:", Path.cwd())
         sys.exit(1)
-